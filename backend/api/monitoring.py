@@ -7,7 +7,7 @@ Provides endpoints for monitoring and observability:
 - /logs: Recent application logs
 """
 
-import sqlite3
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -32,7 +32,7 @@ async def health_check() -> Dict[str, Any]:
         Dict containing health status of all system components
     """
     try:
-        health_results = health_checker.run_all_checks()
+        health_results = await health_checker.run_all_checks()
         overall_health = all(health_results.values())
         
         return {
@@ -79,22 +79,23 @@ async def get_detailed_metrics(hours: int = 24) -> Dict[str, Any]:
         basic_metrics = metrics.get_metrics_summary(hours)
         
         # Get recent API calls
-        with sqlite3.connect(metrics.db_path) as conn:
+        since = int(time.time()) - int(hours) * 3600
+        with metrics.read_connection() as conn:
             recent_calls = conn.execute('''
-                SELECT endpoint, method, response_time, status_code, timestamp
+                SELECT endpoint, method, response_time, status_code, datetime(ts, 'unixepoch')
                 FROM api_metrics 
-                WHERE timestamp > datetime('now', '-{} hours')
-                ORDER BY timestamp DESC
+                WHERE ts > ?
+                ORDER BY ts DESC
                 LIMIT 50
-            '''.format(hours)).fetchall()
+            ''', (since,)).fetchall()
             
             recent_errors = conn.execute('''
-                SELECT error_type, message, timestamp
+                SELECT error_type, message, datetime(ts, 'unixepoch')
                 FROM errors 
-                WHERE timestamp > datetime('now', '-{} hours')
-                ORDER BY timestamp DESC
+                WHERE ts > ?
+                ORDER BY ts DESC
                 LIMIT 20
-            '''.format(hours)).fetchall()
+            ''', (since,)).fetchall()
         
         return {
             "period_hours": hours,
@@ -177,18 +178,12 @@ async def system_status() -> Dict[str, Any]:
     """
     try:
         # Get health status
-        health_results = health_checker.run_all_checks()
+        health_results = await health_checker.run_all_checks()
         overall_health = all(health_results.values())
         
-        # Get recent metrics
+        # Get recent metrics (the summary already counts errors in the window)
         recent_metrics = metrics.get_metrics_summary(1)  # Last hour
-        
-        # Get recent errors
-        with sqlite3.connect(metrics.db_path) as conn:
-            recent_error_count = conn.execute('''
-                SELECT COUNT(*) FROM errors 
-                WHERE timestamp > datetime('now', '-1 hour')
-            ''').fetchone()[0]
+        recent_error_count = recent_metrics.get('total_errors', 0)
         
         return {
             "status": "operational" if overall_health else "degraded",
@@ -6,7 +6,7 @@ with enhanced security, input validation, and error handling.
 """
 import logging
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,6 +25,40 @@ from ..services.security import validate_coordinates, validate_location_input
 logger = logging.getLogger(__name__)
 weather_router = APIRouter()
 
+async def _resolve_location(
+    lat: Optional[float],
+    lon: Optional[float],
+    city: Optional[str],
+    state: Optional[str],
+    zip_code: Optional[str],
+    country: str
+) -> Tuple[float, float, str]:
+    """Validate location parameters and resolve them to coordinates."""
+    if lat is not None and lon is not None:
+        # Validate coordinates
+        resolved_lat, resolved_lon = validate_coordinates(lat, lon)
+        location = f"{lat},{lon}"
+    elif city and state:
+        # Validate location input
+        validate_location_input(city=city, state=state)
+        resolved_lat, resolved_lon = await weather_client.geocode_city(
+            city=city, state=state, country=country
+        )
+        location = f"{city},{state}"
+    elif zip_code:
+        # Validate ZIP code
+        validate_location_input(zip_code=zip_code)
+        resolved_lat, resolved_lon = await weather_client.geocode_zip(
+            zip_code=zip_code, country=country
+        )
+        location = zip_code
+    else:
+        raise ValidationException(
+            "Must provide lat/lon, city/state, or zip_code",
+            details={"required": "One of: coordinates, city+state, or zip_code"}
+        )
+    return resolved_lat, resolved_lon, location
+
 @weather_router.get("/current", response_model=Dict[str, Any])
 async def current_weather(
     request: Request,
@@ -37,30 +71,9 @@ async def current_weather(
 ):
     """Get current weather for a given location with input validation."""
     try:
-        # Validate input parameters
-        if lat is not None and lon is not None:
-            # Validate coordinates
-            resolved_lat, resolved_lon = validate_coordinates(lat, lon)
-            location = f"{lat},{lon}"
-        elif city and state:
-            # Validate location input
-            validate_location_input(city=city, state=state)
-            resolved_lat, resolved_lon = await weather_client.geocode_city(
-                city=city, state=state, country=country
-            )
-            location = f"{city},{state}"
-        elif zip_code:
-            # Validate ZIP code
-            validate_location_input(zip_code=zip_code)
-            resolved_lat, resolved_lon = await weather_client.geocode_zip(
-                zip_code=zip_code, country=country
-            )
-            location = zip_code
-        else:
-            raise ValidationException(
-                "Must provide lat/lon, city/state, or zip_code",
-                details={"required": "One of: coordinates, city+state, or zip_code"}
-            )
+        resolved_lat, resolved_lon, location = await _resolve_location(
+            lat, lon, city, state, zip_code, country
+        )
         
         # Record weather request metric
         record_weather_request("success", location)
@@ -91,30 +104,9 @@ async def forecast(
 ):
     """Get 5-day weather forecast for a given location with input validation."""
     try:
-        # Validate input parameters
-        if lat is not None and lon is not None:
-            # Validate coordinates
-            resolved_lat, resolved_lon = validate_coordinates(lat, lon)
-            location = f"{lat},{lon}"
-        elif city and state:
-            # Validate location input
-            validate_location_input(city=city, state=state)
-            resolved_lat, resolved_lon = await weather_client.geocode_city(
-                city=city, state=state, country=country
-            )
-            location = f"{city},{state}"
-        elif zip_code:
-            # Validate ZIP code
-            validate_location_input(zip_code=zip_code)
-            resolved_lat, resolved_lon = await weather_client.geocode_zip(
-                zip_code=zip_code, country=country
-            )
-            location = zip_code
-        else:
-            raise ValidationException(
-                "Must provide lat/lon, city/state, or zip_code",
-                details={"required": "One of: coordinates, city+state, or zip_code"}
-            )
+        resolved_lat, resolved_lon, location = await _resolve_location(
+            lat, lon, city, state, zip_code, country
+        )
         
         # Record weather request metric
         record_weather_request("success", location)
@@ -133,6 +125,39 @@ async def forecast(
         logger.error(f"Weather forecast error: {e}", exc_info=True)
         raise ExternalAPIException("OpenWeatherMap", "Failed to fetch forecast data")
 
+@weather_router.get("/bundle", response_model=Dict[str, Any])
+async def weather_bundle(
+    request: Request,
+    lat: float = Query(None, description="Latitude (-90 to 90)"),
+    lon: float = Query(None, description="Longitude (-180 to 180)"),
+    city: str = Query(None, description="City name"),
+    state: str = Query(None, description="State/province"),
+    zip_code: str = Query(None, description="ZIP/postal code"),
+    country: str = Query("US", description="Country code")
+):
+    """Get current weather and 5-day forecast for a location in one request."""
+    try:
+        resolved_lat, resolved_lon, location = await _resolve_location(
+            lat, lon, city, state, zip_code, country
+        )
+        
+        # Record weather request metric
+        record_weather_request("success", location)
+        
+        return await weather_client.get_weather_bundle(
+            lat=resolved_lat, lon=resolved_lon
+        )
+    except ValidationException:
+        record_weather_request("validation_error", "unknown")
+        raise
+    except ValueError as e:
+        record_weather_request("validation_error", "unknown")
+        raise ValidationException(str(e))
+    except Exception as e:
+        record_weather_request("error", "unknown")
+        logger.error(f"Weather bundle error: {e}", exc_info=True)
+        raise ExternalAPIException("OpenWeatherMap", "Failed to fetch weather data")
+
 @weather_router.get("/settings", response_model=WeatherSettingsResponse)
 async def get_weather_settings(db: AsyncSession = Depends(get_db)):
     """Get current preferred weather location."""
@@ -53,6 +53,7 @@ class Settings(BaseSettings):
     # API Rate Limiting
     rate_limit_requests: int = Field(default=100, env="RATE_LIMIT_REQUESTS")
     rate_limit_window: int = Field(default=60, env="RATE_LIMIT_WINDOW")  # seconds
+    redis_url: Optional[str] = Field(default=None, env="REDIS_URL")  # shared limits across workers
     
     # External APIs
     openweathermap_api_key: Optional[str] = Field(default=None, env="OPENWEATHERMAP_API_KEY")
@@ -83,6 +84,8 @@ class Settings(BaseSettings):
         default="./data/metrics.db",
         env="METRICS_DB_PATH"
     )
+    # Fraction of fast, successful API calls recorded; errors and slow calls always are
+    metrics_sample_rate: float = Field(default=1.0, ge=0.001, le=1.0, env="METRICS_SAMPLE_RATE")
     prometheus_multiproc_dir: str = Field(
         default="./tmp/prometheus_multiproc",
         env="PROMETHEUS_MULTIPROC_DIR"
@@ -5,12 +5,15 @@ Provides comprehensive logging setup with structured output, file rotation,
 and production-ready configuration for the Family Dashboard API.
 """
 
+import atexit
+import copy
 import json
 import logging
 import logging.handlers
+import queue
 import sys
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from ..services.security_utils import sanitize_for_logging
 from .config import settings
@@ -100,6 +103,54 @@ class HumanReadableFormatter(logging.Formatter):
         return formatted
 
 
+# Listeners doing file/console I/O on behalf of the queue-backed loggers
+_queue_listeners: List[logging.handlers.QueueListener] = []
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener's handlers.
+    
+    The stock handler formats each record on the calling thread and strips
+    exc_info, which would defeat the structured formatters. Records stay in
+    process, so only the message arguments are merged here.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Copy the record with its message arguments merged in."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def stop_queue_listeners() -> None:
+    """Flush and stop the listeners started by setup_logging."""
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+
+atexit.register(stop_queue_listeners)
+
+
+def move_handlers_to_queue(logger: logging.Logger) -> None:
+    """Replace a logger's handlers with a queue feeding a listener thread.
+    
+    Logging calls then only enqueue the record; the original handlers run on
+    the listener thread, still honouring their own levels.
+    """
+    # A queue handler left by an earlier setup_logging call is stale; its
+    # listener has already been stopped
+    handlers = [h for h in logger.handlers if not isinstance(h, DeferredQueueHandler)]
+    if not handlers:
+        return
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.handlers[:] = [DeferredQueueHandler(log_queue)]
+    listener.start()
+    _queue_listeners.append(listener)
+
+
 def setup_logging() -> None:
     """Setup comprehensive logging configuration."""
     # Create logs directory if it doesn't exist
@@ -109,7 +160,8 @@ def setup_logging() -> None:
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, str(settings.log_level).upper()))
     
-    # Clear existing handlers
+    # Clear existing handlers, stopping any listeners from an earlier call
+    stop_queue_listeners()
     root_logger.handlers.clear()
     
     # Choose formatter based on environment
@@ -125,6 +177,11 @@ def setup_logging() -> None:
     if settings.debug or getattr(settings, "console_logging", False):
         setup_console_handler(root_logger, formatter)
     
+    # File and console writes happen on listener threads, so request paths
+    # only pay for an enqueue
+    for logger_name in (None, "security", "performance"):
+        move_handlers_to_queue(logging.getLogger(logger_name))
+    
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
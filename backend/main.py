@@ -84,6 +84,9 @@ async def lifespan(app: FastAPI):
     await http_client.close()
     logger.info("HTTP client closed")
     
+    # Close rate limiter backend
+    await rate_limiter.close()
+    
     # Close database connections
     await close_db()
     logger.info("Database connections closed")
@@ -160,11 +163,12 @@ async def security_middleware(request: Request, call_next):
     """Add security headers and rate limiting."""
     # Rate limiting
     client_id = get_client_id(request)
-    if not rate_limiter.is_allowed(
+    allowed, remaining = await rate_limiter.check(
         client_id, 
         settings.rate_limit_requests, 
         settings.rate_limit_window
-    ):
+    )
+    if not allowed:
         # Record rate limit hit in metrics
         record_rate_limit_hit(client_id)
         
@@ -199,11 +203,6 @@ async def security_middleware(request: Request, call_next):
     add_security_headers(request, response)
     
     # Add rate limit headers
-    remaining = rate_limiter.get_remaining(
-        client_id, 
-        settings.rate_limit_requests, 
-        settings.rate_limit_window
-    )
     response.headers["X-RateLimit-Remaining"] = str(remaining)
     response.headers["X-RateLimit-Reset"] = str(settings.rate_limit_window)
     
@@ -307,8 +306,8 @@ async def root():
 async def check_openweathermap_health() -> dict:
     """Check OpenWeatherMap API health by fetching weather for Austin, TX."""
     try:
-        # Austin, TX coordinates
-        result = await weather_client.get_current_weather(lat=30.2672, lon=-97.7431)
+        # Austin, TX coordinates; bypass the cache so an outage is not masked
+        result = await weather_client.get_current_weather(lat=30.2672, lon=-97.7431, use_cache=False)
         if result and "weather" in result:
             return {"status": "healthy"}
         return {"status": "unhealthy", "error": "No weather data returned"}
@@ -0,0 +1,108 @@
+"""
+In-Process TTL Cache
+
+Provides a small dictionary-backed cache whose entries expire after a fixed
+time-to-live, used to avoid repeating slow upstream lookups.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+def coordinate_key(lat: float, lon: float) -> Tuple[float, float]:
+    """Build a cache key that collapses near-identical coordinates."""
+    return round(lat, 3), round(lon, 3)
+
+
+class TTLCache:
+    """Bounded in-memory cache with per-entry expiry."""
+
+    def __init__(self, ttl: Optional[float], maxsize: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays fresh (None keeps entries until evicted)
+            maxsize: Maximum number of entries held at once
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[Optional[float], Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._lock_users: Dict[Hashable, int] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the oldest entry when full."""
+        if key not in self._data and len(self._data) >= self.maxsize:
+            self._evict()
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires_at, value)
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, awaiting fetch() to fill it on a miss.
+        
+        Concurrent misses for the same key wait on a per-key lock, so only one
+        fetch runs and the others read its result from the cache.
+        
+        Args:
+            key: Cache key
+            fetch: Zero-argument coroutine function producing the value
+            
+        Returns:
+            The cached or freshly fetched value
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        # The lock is shared by its holder and every waiter, and is only
+        # dropped once the last of them is done with it. Dropping it as soon
+        # as it is released would let a new caller fetch alongside waiters
+        # that were woken but have not yet re-acquired it.
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                value = self.get(key, _MISSING)
+                if value is _MISSING:
+                    value = await fetch()
+                    self.set(key, value)
+                return value
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+    
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self) -> None:
+        """Drop expired entries, or the oldest entry if none have expired."""
+        now = time.monotonic()
+        expired = [k for k, (exp, _) in self._data.items() if exp is not None and exp <= now]
+        for key in expired:
+            del self._data[key]
+        if not expired and self._data:
+            del self._data[next(iter(self._data))]
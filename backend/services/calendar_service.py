@@ -6,17 +6,26 @@ Provides functionality to fetch and manage Google Calendar events.
 - Token is stored locally for persistent access.
 """
 
+import asyncio
+import hashlib
+import heapq
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import orjson
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
 
 from ..schemas.calendar import CalendarEvent
-from .sync_token_db import get_sync_token, set_sync_token
+from .cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +35,20 @@ logging.getLogger('googleapiclient.discovery_cache').setLevel(logging.ERROR)
 # If modifying these scopes, delete the file token.json.
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# Upper bound on calendars fetched concurrently across all fetches, to stay
+# within API quota
+MAX_CALENDAR_WORKERS = 8
+
+# How long the user's calendar list is reused before asking Google again
+CALENDAR_LIST_CACHE_TTL = 10 * 60
+
+# Retries for 429/5xx responses; googleapiclient backs off exponentially with jitter
+GOOGLE_API_RETRIES = 4
+
+# Partial-response masks: only request the fields this module reads
+CALENDAR_LIST_FIELDS = "items(id,summary,colorId)"
+EVENT_LIST_FIELDS = "items(id,summary,start,end,description,location,colorId),nextPageToken"
+
 # Google Calendar color ID to Tailwind CSS class mapping
 COLOR_ID_MAP = {
     '1': 'bg-blue-100 text-blue-800 hover:bg-blue-200 border-blue-400',
@@ -58,176 +81,301 @@ DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 CREDENTIALS_FILE = os.path.join(DATA_DIR, "credentials.json")
 TOKEN_FILE = os.path.join(DATA_DIR, "token.json")
 
+# Credentials and service are built once and reused across requests
+_creds: Optional[Credentials] = None
+_service = None
+_service_lock = threading.Lock()
+_token_digest: Optional[bytes] = None
+_thread_local = threading.local()
+_calendar_list_cache = TTLCache(ttl=CALENDAR_LIST_CACHE_TTL, maxsize=1)
+
+# Bounded pool for whole-fetch jobs, kept apart from the default executor;
+# each job fans out to the shared per-calendar pool
+_fetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="gcal")
+_calendar_executor = ThreadPoolExecutor(max_workers=MAX_CALENDAR_WORKERS, thread_name_prefix="gcal-calendar")
+
+# Event fetches currently running, keyed by (start, end)
+_inflight_fetches: Dict[Tuple[Optional[str], Optional[str]], asyncio.Future] = {}
+
+def _digest(payload: bytes) -> bytes:
+    """Return a short fingerprint of token file contents."""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+def _save_token(creds: Credentials) -> None:
+    """Atomically rewrite the token file, skipping the write if nothing changed.
+    
+    Must be called with _service_lock held.
+    """
+    global _token_digest
+    
+    payload = creds.to_json().encode('utf-8')
+    digest = _digest(payload)
+    if digest == _token_digest:
+        logger.debug("Refreshed credentials unchanged, not rewriting token file")
+        return
+    
+    # Write to a temporary file and swap it in so a crash never leaves a torn token
+    tmp_path = TOKEN_FILE + '.tmp'
+    with open(tmp_path, 'wb') as token:
+        token.write(payload)
+        token.flush()
+        os.fsync(token.fileno())
+    os.replace(tmp_path, TOKEN_FILE)
+    _token_digest = digest
+    logger.debug("Refreshed credentials saved")
+
+def _reset_credentials() -> None:
+    """Forget the cached credentials and service so the next call reloads token.json.
+    
+    Used after an authentication failure, so an operator replacing the token
+    file is picked up without a restart.
+    """
+    global _creds, _service
+    
+    with _service_lock:
+        _creds = None
+        _service = None
+
 def get_google_calendar_service():
-    """Get authenticated Google Calendar service."""
-    creds = None
-   
-    # Load credentials securely
-    try:
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-            logger.debug("Loaded existing Google Calendar token")
-       
-        # If there are no (valid) credentials available
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                logger.debug("Refreshing expired Google Calendar token")
-                creds.refresh(Request())
-                
-                # Save the refreshed credentials
-                with open(TOKEN_FILE, 'w') as token:
-                    token.write(creds.to_json())
-                logger.debug("Refreshed credentials saved")
-            else:
-                # No valid credentials - cannot proceed in headless environment
-                logger.error("No valid Google Calendar credentials found")
-                logger.error("Initial authentication required. Please run the setup script with GUI access:")
-                logger.error("python3 setup_google_auth.py")
-                raise Exception(
-                    "Google Calendar authentication required. "
-                    "Run setup_google_auth.py on a machine with GUI access, "
-                    "then copy the token file to this server."
-                )
-       
-        service = build("calendar", "v3", credentials=creds, cache_discovery=False)
-        logger.info("Google Calendar service initialized successfully")
-        return service
-       
-    except Exception as e:
-        logger.error(f"Failed to initialize Google Calendar service: {type(e).__name__}")
-        raise
+    """Get authenticated Google Calendar service.
+    
+    The credentials and service object are cached at module level; the token
+    file is only read on first use (or again after a failure) and only
+    rewritten after a refresh.
+    """
+    global _creds, _service, _token_digest
+    
+    with _service_lock:
+        # Load credentials securely
+        try:
+            if _creds is None and os.path.exists(TOKEN_FILE):
+                with open(TOKEN_FILE, 'rb') as token:
+                    payload = token.read()
+                _creds = Credentials.from_authorized_user_info(orjson.loads(payload), SCOPES)
+                _token_digest = _digest(payload)
+                logger.debug("Loaded existing Google Calendar token")
+            creds = _creds
+           
+            # If there are no (valid) credentials available
+            if not creds or not creds.valid:
+                if creds and creds.expired and creds.refresh_token:
+                    logger.debug("Refreshing expired Google Calendar token")
+                    creds.refresh(Request())
+                    
+                    # Save the refreshed credentials
+                    _save_token(creds)
+                else:
+                    # No valid credentials - cannot proceed in headless environment
+                    logger.error("No valid Google Calendar credentials found")
+                    logger.error("Initial authentication required. Please run the setup script with GUI access:")
+                    logger.error("python3 setup_google_auth.py")
+                    raise Exception(
+                        "Google Calendar authentication required. "
+                        "Run setup_google_auth.py on a machine with GUI access, "
+                        "then copy the token file to this server."
+                    )
+           
+            if _service is None:
+                _service = build("calendar", "v3", credentials=creds, cache_discovery=False, static_discovery=True)
+                logger.info("Google Calendar service initialized successfully")
+            return _service
+           
+        except Exception as e:
+            # Drop whatever was loaded so the next call re-reads the token file
+            _creds = None
+            _service = None
+            logger.error(f"Failed to initialize Google Calendar service: {type(e).__name__}")
+            raise
 
-async def get_upcoming_events(start: Optional[str] = None, end: Optional[str] = None) -> List[CalendarEvent]:
-    """Fetch Google Calendar events (all calendars) in a date range.
+def _get_thread_http():
+    """Return an authorized HTTP transport private to the calling thread.
+    
+    httplib2 connections are not thread-safe, so each worker thread executes
+    its requests over its own transport instead of the service's shared one.
+    build_http() gives it the same socket timeout as the service's default
+    transport, and since the pools' threads are long-lived so are the
+    transports and their connections. A transport is rebuilt once the
+    credentials it was made for have been reloaded.
+    """
+    creds = _creds
+    http = getattr(_thread_local, "http", None)
+    if http is None or _thread_local.creds is not creds:
+        http = AuthorizedHttp(creds, http=build_http())
+        _thread_local.http = http
+        _thread_local.creds = creds
+    return http
+
+def _start_sort_key(event: CalendarEvent) -> datetime:
+    """Return an event's start as an aware datetime for chronological ordering.
+    
+    Timed events carry an RFC3339 string in their calendar's own offset, so
+    the raw strings do not compare chronologically; all-day events carry a
+    bare date, which is treated as midnight UTC.
+    """
+    start = event.start
+    if len(start) == 10:
+        return datetime.fromisoformat(start).replace(tzinfo=timezone.utc)
+    return datetime.fromisoformat(start.replace('Z', '+00:00'))
+
+def _fetch_calendar(service, calendar: dict, start: str, end: str) -> List[CalendarEvent]:
+    """Fetch all pages of events for a single calendar.
     
     Args:
-        start: Start date in ISO format (default: now)
-        end: End date in ISO format (default: 7 days from now)
+        service: Authenticated Google Calendar service
+        calendar: Calendar list entry
+        start: Start date in ISO format
+        end: End date in ISO format
         
     Returns:
-        List of calendar events
+        The calendar's events in the range, ordered by start time
     """
-    try:
-        service = get_google_calendar_service()
+    calendar_id = calendar['id']
+    calendar_name = calendar.get('summary', 'Unknown')
+    colorId = calendar.get('colorId', "1")
+    color_class = get_color_class_from_id(colorId)
+    logger.info(f"Processing calendar: {calendar} with colorId: {colorId}")
+    
+    logger.debug(f"Fetching events for calendar: {calendar_name}", extra={
+        "extra_fields": {
+            "calendar_id": calendar_id,
+            "calendar_name": calendar_name
+        }
+    })
+    
+    http = _get_thread_http()
+    events_out = []
+    
+    # Always a full listing of the window: Events.list rejects syncToken
+    # together with timeMin/timeMax/orderBy, and an incremental sync would
+    # only return changed events anyway
+    list_kwargs = {
+        "calendarId": calendar_id,
+        "timeMin": start,
+        "timeMax": end,
+        "singleEvents": True,
+        "orderBy": "startTime",
+        "fields": EVENT_LIST_FIELDS,
+        "pageToken": None
+    }
+    
+    events_result = service.events().list(**list_kwargs).execute(http=http, num_retries=GOOGLE_API_RETRIES)
+    
+    # Hoisted out of the per-event loop below
+    append = events_out.append
+    debug = logger.isEnabledFor(logging.DEBUG)
+    
+    while True:
+        events = events_result.get('items', [])
+        for event in events:
+            if debug:
+                logger.debug(f"Processing color_id: {event.get('colorId')} for calendar {calendar_name}")
+            # Fields come straight from the Google API, so skip validation
+            append(CalendarEvent.model_construct(
+                id=event['id'],
+                summary=event.get('summary', 'No Title'),
+                start=event['start'].get('dateTime', event['start'].get('date')),
+                end=event['end'].get('dateTime', event['end'].get('date')),
+                description=event.get('description', ''),
+                location=event.get('location', ''),
+                calendarId=calendar_id,
+                calendarName=calendar_name,
+                color_id=event.get('colorId'),
+                color_class=color_class
+            ))
         
-        # Set default date range if not provided
+        # Handle pagination
+        page_token = events_result.get("nextPageToken")
+        if not page_token:
+            break
+        list_kwargs["pageToken"] = page_token
+        events_result = service.events().list(**list_kwargs).execute(http=http, num_retries=GOOGLE_API_RETRIES)
+    
+    logger.debug(f"Retrieved {len(events_out)} events from calendar {calendar_name}")
+    return events_out
+
+def _fetch_events_sync(start: Optional[str], end: Optional[str]) -> List[CalendarEvent]:
+    """Fetch events from all calendars in parallel on the shared calendar pool."""
+    service = get_google_calendar_service()
+    
+    # Set default date range if not provided, from a single clock reading
+    if not start or not end:
+        now = datetime.now(timezone.utc)
         if not start:
-            start = datetime.now(timezone.utc).isoformat()
+            start = now.isoformat()
         if not end:
-            end = (datetime.now(timezone.utc) + timedelta(days=7)).isoformat()
-        
-        logger.debug("Fetching Google Calendar events", extra={
-            "extra_fields": {
-                "start_date": start,
-                "end_date": end,
-                "calendars": "all"
-            }
-        })
-        
-        # Get all calendars
-        calendar_list = service.calendarList().list().execute()
+            end = (now + timedelta(days=7)).isoformat()
+    
+    logger.debug("Fetching Google Calendar events", extra={
+        "extra_fields": {
+            "start_date": start,
+            "end_date": end,
+            "calendars": "all"
+        }
+    })
+    
+    # Get all calendars; the list rarely changes, so reuse it for a while
+    calendars = _calendar_list_cache.get("items")
+    if calendars is None:
+        calendar_list = service.calendarList().list(fields=CALENDAR_LIST_FIELDS).execute(http=_get_thread_http(), num_retries=GOOGLE_API_RETRIES)
         calendars = calendar_list.get('items', [])
-        
-        all_events = []
-        
-        for calendar in calendars:
-            calendar_id = calendar['id']
-            calendar_name = calendar.get('summary', 'Unknown')
-            colorId = calendar.get('colorId', "1")
-            logger.info(f"Processing calendar: {calendar} with colorId: {colorId}")
-            
-            logger.debug(f"Fetching events for calendar: {calendar_name}", extra={
-                "extra_fields": {
-                    "calendar_id": calendar_id,
-                    "calendar_name": calendar_name
-                }
-            })
-            
+        _calendar_list_cache.set("items", calendars)
+    
+    per_calendar_events = []
+    
+    if calendars:
+        futures = {
+            _calendar_executor.submit(_fetch_calendar, service, calendar, start, end): calendar
+            for calendar in calendars
+        }
+        for future in as_completed(futures):
+            calendar_name = futures[future].get('summary', 'Unknown')
             try:
-                # Get sync token for this calendar
-                sync_token = get_sync_token(calendar_id)
-                
-                # Prepare list parameters
-                list_kwargs = {
-                    "calendarId": calendar_id,
-                    "timeMin": start,
-                    "timeMax": end,
-                    "singleEvents": True,
-                    "orderBy": "startTime",
-                    "pageToken": None
-                }
-                
-                # Only use syncToken if no custom range is requested
-                if sync_token and not start and not end:
-                    list_kwargs["syncToken"] = sync_token
-                
-                events_result = service.events().list(**list_kwargs).execute()
-                events = events_result.get('items', [])
-                
-                # If sync token is invalid, do a full sync
-                if events_result.get('nextSyncToken') is None and sync_token:
-                    logger.warning(f"Invalid sync token for calendar {calendar_name}, doing full sync")
-                    sync_token = None
-                    list_kwargs.pop("syncToken", None)
-                    events_result = service.events().list(**list_kwargs).execute()
-                    events = events_result.get('items', [])
-                
-                # Process events
-                for event in events:
-                    logger.info(f"Processing color_id: {event.get('colorId')} for calendar {calendar_name}")
-                    event_obj = CalendarEvent(
-                        id=event['id'],
-                        summary=event.get('summary', 'No Title'),
-                        start=event['start'].get('dateTime', event['start'].get('date')),
-                        end=event['end'].get('dateTime', event['end'].get('date')),
-                        description=event.get('description', ''),
-                        location=event.get('location', ''),
-                        calendarId=calendar_id,
-                        calendarName=calendar_name,
-                        color_id=event.get('colorId'),
-                        color_class = get_color_class_from_id(calendar.get('colorId', '1'))
-                    )
-                    all_events.append(event_obj)
-                
-                # Handle pagination
-                page_token = events_result.get("nextPageToken")
-                while page_token:
-                    list_kwargs["pageToken"] = page_token
-                    events_result = service.events().list(**list_kwargs).execute()
-                    events = events_result.get('items', [])
-                    
-                    for event in events:
-                        logger.debug(f"Processing color_id: {event.get('colorId')} for calendar {calendar_name}")
-                        event_obj = CalendarEvent(
-                            id=event['id'],
-                            summary=event.get('summary', 'No Title'),
-                            start=event['start'].get('dateTime', event['start'].get('date')),
-                            end=event['end'].get('dateTime', event['end'].get('date')),
-                            description=event.get('description', ''),
-                            location=event.get('location', ''),
-                            calendarId=calendar_id,
-                            calendarName=calendar_name,
-                            color_id=event.get('colorId'),
-                            color_class = get_color_class_from_id(calendar.get('colorId', '1'))
-                        )
-                        all_events.append(event_obj)
-                    
-                    page_token = events_result.get("nextPageToken")
-                    if not page_token:
-                        # Store new sync token if present and not a custom range
-                        new_sync_token = events_result.get("nextSyncToken")
-                        if new_sync_token and not start and not end:
-                            set_sync_token(calendar_id, new_sync_token)
-                
-                logger.debug(f"Retrieved {len(events)} events from calendar {calendar_name}")
-                
+                events = future.result()
+            except RefreshError as e:
+                # Revoked or expired refresh token: reload token.json next time
+                _reset_credentials()
+                logger.error(f"Google Calendar credentials rejected for calendar {calendar_name}: {type(e).__name__}")
+                continue
             except Exception as e:
                 logger.error(f"Error fetching events for calendar {calendar_name}: {type(e).__name__}: {str(e)}", exc_info=True)
                 continue
+            per_calendar_events.append(events)
+    
+    # Each calendar's events already arrive ordered by start time, so a k-way
+    # merge on the parsed start is enough to order the combined list
+    all_events = list(heapq.merge(*per_calendar_events, key=_start_sort_key))
+    
+    logger.info(f"Successfully retrieved {len(all_events)} total events from {len(calendars)} calendars")
+    return all_events
+
+async def get_upcoming_events(start: Optional[str] = None, end: Optional[str] = None) -> List[CalendarEvent]:
+    """Fetch Google Calendar events (all calendars) in a date range.
+    
+    The blocking Google API calls run in a worker thread so the event loop
+    stays responsive while calendars are fetched in parallel. Callers asking
+    for the same range while a fetch is in flight await that fetch instead of
+    starting another.
+    
+    Args:
+        start: Start date in ISO format (default: now)
+        end: End date in ISO format (default: 7 days from now)
         
-        logger.info(f"Successfully retrieved {len(all_events)} total events from {len(calendars)} calendars")
-        return all_events
+    Returns:
+        List of calendar events
+    """
+    try:
+        # Single-flight: concurrent requests for the same range share one fetch
+        key = (start, end)
+        future = _inflight_fetches.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(_fetch_executor, _fetch_events_sync, start, end)
+            _inflight_fetches[key] = future
+            future.add_done_callback(lambda _: _inflight_fetches.pop(key, None))
+        
+        # Shield the shared fetch so one cancelled caller does not fail the rest
+        return list(await asyncio.shield(future))
         
     except Exception as e:
         logger.error(f"Failed to fetch Google Calendar events: {type(e).__name__}: {str(e)}", exc_info=True)
-        raise
\ No newline at end of file
+        raise
@@ -11,14 +11,19 @@ from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Dict, Optional
 
 import aiohttp
+import orjson
 from aiohttp import ClientSession, ClientTimeout
 from aiohttp.connector import TCPConnector
+from fastapi import HTTPException
 
 from ..core.config import settings
+from .cache import TTLCache, coordinate_key
 from .security_utils import sanitize_for_logging
 
 logger = logging.getLogger(__name__)
 
+# Geocoding results for a city or ZIP code effectively never change
+GEOCODE_CACHE_TTL = 24 * 60 * 60  # seconds
 
 class HTTPClientManager:
     """Manages HTTP client sessions with connection pooling."""
@@ -102,7 +107,7 @@ async def make_request(
         async with http_client.session() as session:
             async with session.request(method, url, **kwargs) as response:
                 response.raise_for_status()
-                return await response.json()
+                return await response.json(loads=orjson.loads)
     except aiohttp.ClientError as e:
         raise HTTPException(
             status_code=500,
@@ -139,9 +144,26 @@ class WeatherAPIClient:
         self.base_url = settings.openweathermap_base_url
         self.api_key = settings.openweathermap_api_key
         self.timeout = settings.openweathermap_timeout
+        self.cache_enabled = settings.cache_enabled
+        self._weather_cache = TTLCache(ttl=settings.cache_ttl)
+        self._forecast_cache = TTLCache(ttl=settings.cache_ttl)
+        self._geocode_cache = TTLCache(ttl=GEOCODE_CACHE_TTL)
     
-    async def get_current_weather(self, lat: float, lon: float) -> Dict:
-        """Get current weather data."""
+    async def get_current_weather(self, lat: float, lon: float, use_cache: bool = True) -> Dict:
+        """Get current weather data.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            use_cache: Set False to always query the API, e.g. for health checks
+        """
+        if not self.cache_enabled or not use_cache:
+            return await self._fetch_current_weather(lat, lon)
+        cache_key = coordinate_key(lat, lon)
+        return await self._weather_cache.get_or_fetch(cache_key, lambda: self._fetch_current_weather(lat, lon))
+    
+    async def _fetch_current_weather(self, lat: float, lon: float) -> Dict:
+        """Fetch current weather data, bypassing the cache."""
         url = f"{self.base_url}/data/2.5/weather"
         params = {
             "lat": lat,
@@ -151,28 +173,37 @@ class WeatherAPIClient:
         }
         
         # Log request with masked API key
-        safe_params = params.copy()
-        safe_params["appid"] = "[REDACTED]"
-        logger.debug("Making weather API request", extra={
-            "extra_fields": {
-                "url": url,
-                "params": safe_params,
-                "lat": lat,
-                "lon": lon
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            safe_params = params.copy()
+            safe_params["appid"] = "[REDACTED]"
+            logger.debug("Making weather API request", extra={
+                "extra_fields": {
+                    "url": url,
+                    "params": safe_params,
+                    "lat": lat,
+                    "lon": lon
+                }
+            })
         
         data = await get_json(url, params=params)
-        logger.debug("Weather API request successful", extra={
-            "extra_fields": {
-                "url": url,
-                "response_size": len(str(data))
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Weather API request successful", extra={
+                "extra_fields": {
+                    "url": url,
+                    "response_size": len(str(data))
+                }
+            })
         return {"weather": data}
     
     async def get_forecast(self, lat: float, lon: float) -> Dict:
         """Get 5-day weather forecast."""
+        if not self.cache_enabled:
+            return await self._fetch_forecast(lat, lon)
+        cache_key = coordinate_key(lat, lon)
+        return await self._forecast_cache.get_or_fetch(cache_key, lambda: self._fetch_forecast(lat, lon))
+    
+    async def _fetch_forecast(self, lat: float, lon: float) -> Dict:
+        """Fetch the 5-day weather forecast, bypassing the cache."""
         url = f"{self.base_url}/data/2.5/forecast"
         params = {
             "lat": lat,
@@ -182,28 +213,45 @@ class WeatherAPIClient:
         }
         
         # Log request with masked API key
-        safe_params = params.copy()
-        safe_params["appid"] = "[REDACTED]"
-        logger.debug("Making forecast API request", extra={
-            "extra_fields": {
-                "url": url,
-                "params": safe_params,
-                "lat": lat,
-                "lon": lon
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            safe_params = params.copy()
+            safe_params["appid"] = "[REDACTED]"
+            logger.debug("Making forecast API request", extra={
+                "extra_fields": {
+                    "url": url,
+                    "params": safe_params,
+                    "lat": lat,
+                    "lon": lon
+                }
+            })
         
         data = await get_json(url, params=params)
-        logger.debug("Forecast API request successful", extra={
-            "extra_fields": {
-                "url": url,
-                "response_size": len(str(data))
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Forecast API request successful", extra={
+                "extra_fields": {
+                    "url": url,
+                    "response_size": len(str(data))
+                }
+            })
         return {"forecast": data}
     
+    async def get_weather_bundle(self, lat: float, lon: float) -> Dict:
+        """Get current weather and 5-day forecast concurrently."""
+        current, forecast = await asyncio.gather(
+            self.get_current_weather(lat, lon),
+            self.get_forecast(lat, lon)
+        )
+        return {**current, **forecast}
+    
     async def geocode_city(self, city: str, state: str, country: str = "US") -> tuple[float, float]:
         """Geocode city name to coordinates."""
+        if not self.cache_enabled:
+            return await self._fetch_geocode_city(city, state, country)
+        cache_key = ("city", city.lower(), state.lower(), country.lower())
+        return await self._geocode_cache.get_or_fetch(cache_key, lambda: self._fetch_geocode_city(city, state, country))
+    
+    async def _fetch_geocode_city(self, city: str, state: str, country: str = "US") -> tuple[float, float]:
+        """Geocode a city name, bypassing the cache."""
         url = f"{self.base_url}/geo/1.0/direct"
         params = {
             "q": f"{city},{state},{country}",
@@ -212,32 +260,41 @@ class WeatherAPIClient:
         }
         
         # Log request with masked API key
-        safe_params = params.copy()
-        safe_params["appid"] = "[REDACTED]"
-        logger.debug("Making geocoding API request", extra={
-            "extra_fields": {
-                "url": url,
-                "params": safe_params,
-                "city": city,
-                "state": state,
-                "country": country
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            safe_params = params.copy()
+            safe_params["appid"] = "[REDACTED]"
+            logger.debug("Making geocoding API request", extra={
+                "extra_fields": {
+                    "url": url,
+                    "params": safe_params,
+                    "city": city,
+                    "state": state,
+                    "country": country
+                }
+            })
         
         data = await get_json(url, params=params)
         if not data:
             raise ValueError("Location not found")
         
-        logger.debug("Geocoding API request successful", extra={
-            "extra_fields": {
-                "url": url,
-                "result_count": len(data)
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Geocoding API request successful", extra={
+                "extra_fields": {
+                    "url": url,
+                    "result_count": len(data)
+                }
+            })
         return data[0]["lat"], data[0]["lon"]
     
     async def geocode_zip(self, zip_code: str, country: str = "US") -> tuple[float, float]:
         """Geocode ZIP code to coordinates."""
+        if not self.cache_enabled:
+            return await self._fetch_geocode_zip(zip_code, country)
+        cache_key = ("zip", zip_code.strip(), country.lower())
+        return await self._geocode_cache.get_or_fetch(cache_key, lambda: self._fetch_geocode_zip(zip_code, country))
+    
+    async def _fetch_geocode_zip(self, zip_code: str, country: str = "US") -> tuple[float, float]:
+        """Geocode a ZIP code, bypassing the cache."""
         url = f"{self.base_url}/geo/1.0/zip"
         params = {
             "zip": f"{zip_code},{country}",
@@ -245,24 +302,26 @@ class WeatherAPIClient:
         }
         
         # Log request with masked API key
-        safe_params = params.copy()
-        safe_params["appid"] = "[REDACTED]"
-        logger.debug("Making ZIP geocoding API request", extra={
-            "extra_fields": {
-                "url": url,
-                "params": safe_params,
-                "zip_code": zip_code,
-                "country": country
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            safe_params = params.copy()
+            safe_params["appid"] = "[REDACTED]"
+            logger.debug("Making ZIP geocoding API request", extra={
+                "extra_fields": {
+                    "url": url,
+                    "params": safe_params,
+                    "zip_code": zip_code,
+                    "country": country
+                }
+            })
         
         data = await get_json(url, params=params)
-        logger.debug("ZIP geocoding API request successful", extra={
-            "extra_fields": {
-                "url": url,
-                "result": {"lat": data["lat"], "lon": data["lon"]}
-            }
-        })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("ZIP geocoding API request successful", extra={
+                "extra_fields": {
+                    "url": url,
+                    "result": {"lat": data["lat"], "lon": data["lon"]}
+                }
+            })
         return data["lat"], data["lon"]
 
 
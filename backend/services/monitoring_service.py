@@ -9,15 +9,30 @@ Provides comprehensive monitoring for the dashboard application including:
 - Structured logging
 """
 
-import json
+import asyncio
+import atexit
 import logging
 import os
+import queue
+import random
 import sqlite3
+import sys
+import threading
 import time
+import traceback
+import zlib
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from ..core.config import settings
+from .cache import TTLCache
+from .calendar_service import get_upcoming_events
+from .sync_token_db import DB_PATH
 
 # Ensure logs directory exists
 LOGS_DIR = Path(__file__).parent.parent.parent / 'logs'
@@ -36,18 +51,278 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# How long a connection waits on a locked metrics database before failing
+SQLITE_BUSY_TIMEOUT_MS = 5000
+
+# Write-behind batching: rows are committed together once the batch is full
+# or the oldest queued row has waited this long
+WRITE_BATCH_SIZE = 500
+WRITE_BATCH_INTERVAL = 0.05
+
+# Insert statements shared by the record_* methods and the batch writer
+INSERT_API_METRIC_SQL = 'INSERT INTO api_metrics (endpoint, method, response_time, status_code, sample_rate, ts) VALUES (?, ?, ?, ?, ?, ?)'
+INSERT_ERROR_SQL = 'INSERT INTO errors (error_type, message, stack_trace, context, ts) VALUES (?, ?, ?, ?, ?)'
+INSERT_USAGE_EVENT_SQL = 'INSERT INTO usage_events (event_type, user_agent, ip_address, details, ts) VALUES (?, ?, ?, ?, ?)'
+INSERT_HEALTH_CHECK_SQL = 'INSERT INTO health_checks (check_name, status, response_time, details, ts) VALUES (?, ?, ?, ?, ?)'
+
+# Bumped whenever _ensure_db has to migrate existing tables. Version 1 stores
+# times as INTEGER unix seconds (raw ts, hourly bucket start) instead of TEXT.
+SCHEMA_VERSION = 1
+METRICS_TABLES = (
+    'api_metrics', 'errors', 'usage_events', 'health_checks',
+    'api_metrics_hourly', 'errors_hourly', 'usage_events_hourly'
+)
+
+# Raw rows older than this are folded into the hourly rollup tables and
+# deleted, which keeps the raw tables (and summary scans) bounded
+RAW_METRICS_RETENTION_HOURS = 48
+ROLLUP_INTERVAL = 60 * 60
+
+# monitor_performance samples fast, successful API calls at
+# settings.metrics_sample_rate; errors and calls slower than this are always
+# recorded. Each row stores the rate it was sampled at so summaries can scale
+# counts back up.
+SLOW_REQUEST_THRESHOLD = 0.5  # seconds
+
+def _dumps(data: Any) -> str:
+    """Serialize a context/details payload for storage in a TEXT column."""
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# zlib level for errors.stack_trace; tracebacks are repetitive text and
+# compress well at the default level. Rows written before compression hold
+# TEXT, later ones a BLOB for zlib.decompress.
+STACK_TRACE_COMPRESSION_LEVEL = 6
+
+# Idle read-only connections kept for summary queries
+READ_POOL_SIZE = os.cpu_count() or 4
+
+# Sentinel telling the writer thread to flush and exit
+_STOP = object()
+
 class MetricsCollector:
-    """Collects and stores application metrics."""
+    """Collects and stores application metrics.
+    
+    record_* calls only enqueue a row; a background thread owns the only
+    write connection and commits queued rows in batches. Queries use a pool
+    of read-only connections, which WAL lets run alongside the writer.
+    """
     
     def __init__(self, db_path: str = 'data/metrics.db'):
         self.db_path = db_path
         self._ensure_db()
+        
+        self._read_pool: queue.Queue = queue.Queue(maxsize=READ_POOL_SIZE)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._writer_loop, name="metrics-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+    
+    def close(self, timeout: float = 5.0):
+        """Flush queued rows and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join(timeout)
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
+    def _writer_loop(self):
+        """Drain the queue and write rows in batched transactions."""
+        conn = self._connect()
+        conn.isolation_level = None  # transactions are managed explicitly
+        try:
+            next_rollup = time.monotonic()
+            stop = False
+            while not stop:
+                if time.monotonic() >= next_rollup:
+                    self._rollup(conn)
+                    next_rollup = time.monotonic() + ROLLUP_INTERVAL
+                try:
+                    item = self._queue.get(timeout=max(next_rollup - time.monotonic(), 0))
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + WRITE_BATCH_INTERVAL
+                while len(batch) < WRITE_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+                try:
+                    self._write_batch(conn, batch)
+                except Exception as e:
+                    # Never let one bad batch stop the writer for good
+                    logger.error(f"Failed to write {len(batch)} metrics rows: {e}")
+        finally:
+            conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[str, tuple]]):
+        """Insert a batch of (sql, params) rows in one transaction.
+        
+        Rows are grouped by statement so each table gets a single executemany.
+        """
+        rows_by_sql: Dict[str, List[tuple]] = {}
+        for sql, params in batch:
+            if sql is INSERT_ERROR_SQL:
+                try:
+                    params = self._prepare_error_row(params)
+                except Exception as e:
+                    logger.error(f"Dropping unwritable error row: {e}")
+                    continue
+            rows_by_sql.setdefault(sql, []).append(params)
+        
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for sql, rows in rows_by_sql.items():
+                conn.executemany(sql, rows)
+            conn.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            logger.error(f"Failed to write {len(batch)} metrics rows, retrying one at a time: {e}")
+            # Write rows individually so only the bad ones are lost
+            for sql, rows in rows_by_sql.items():
+                for params in rows:
+                    try:
+                        conn.execute(sql, params)
+                    except Exception as row_error:
+                        logger.error(f"Dropping unwritable metrics row: {row_error}")
+    
+    @staticmethod
+    def _prepare_error_row(params: tuple) -> tuple:
+        """Format and compress an errors row's stack trace for insertion.
+        
+        Exceptions queued by record_exception are formatted here, off the
+        request path. Text from exceptions can hold lone surrogates (e.g.
+        undecodable filenames), which UTF-8 cannot encode, so the message and
+        trace are escaped instead of failing the row.
+        """
+        message, stack_trace = params[1], params[2]
+        if isinstance(stack_trace, tuple):
+            stack_trace = ''.join(traceback.format_exception(*stack_trace))
+        if stack_trace is not None:
+            stack_trace = zlib.compress(
+                stack_trace.encode('utf-8', errors='backslashreplace'),
+                STACK_TRACE_COMPRESSION_LEVEL
+            )
+        message = message.encode('utf-8', errors='backslashreplace').decode('utf-8')
+        return (params[0], message, stack_trace) + params[3:]
+    
+    def _rollup(self, conn: sqlite3.Connection):
+        """Fold raw rows older than the retention window into hourly tables.
+        
+        The cutoff is aligned to an hour boundary so each hour is rolled up
+        exactly once, and the raw rows are deleted in the same transaction.
+        """
+        try:
+            params = {'cutoff': int(time.time()) // 3600 * 3600 - RAW_METRICS_RETENTION_HOURS * 3600}
+            
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('''
+                INSERT INTO api_metrics_hourly (hour, endpoint, calls, sum_response_time, error_calls)
+                SELECT ts / 3600 * 3600, endpoint,
+                       CAST(ROUND(TOTAL(1.0 / sample_rate)) AS INTEGER), TOTAL(response_time / sample_rate),
+                       CAST(ROUND(TOTAL(CASE WHEN status_code >= 400 THEN 1.0 / sample_rate END)) AS INTEGER)
+                FROM api_metrics WHERE ts < :cutoff
+                GROUP BY 1, 2
+                ON CONFLICT (hour, endpoint) DO UPDATE SET
+                    calls = calls + excluded.calls,
+                    sum_response_time = sum_response_time + excluded.sum_response_time,
+                    error_calls = error_calls + excluded.error_calls
+            ''', params)
+            conn.execute('''
+                INSERT INTO errors_hourly (hour, error_type, count)
+                SELECT ts / 3600 * 3600, error_type, COUNT(*)
+                FROM errors WHERE ts < :cutoff
+                GROUP BY 1, 2
+                ON CONFLICT (hour, error_type) DO UPDATE SET count = count + excluded.count
+            ''', params)
+            conn.execute('''
+                INSERT INTO usage_events_hourly (hour, event_type, count)
+                SELECT ts / 3600 * 3600, event_type, COUNT(*)
+                FROM usage_events WHERE ts < :cutoff
+                GROUP BY 1, 2
+                ON CONFLICT (hour, event_type) DO UPDATE SET count = count + excluded.count
+            ''', params)
+            for table in ('api_metrics', 'errors', 'usage_events', 'health_checks'):
+                conn.execute(f'DELETE FROM {table} WHERE ts < :cutoff', params)
+            conn.execute('COMMIT')
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            logger.error(f"Failed to roll up metrics: {e}")
+    
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the per-connection PRAGMAs applied.
+        
+        Args:
+            read_only: Open the database with mode=ro; such connections may be
+                handed between threads by the read pool
+        """
+        if read_only:
+            conn = sqlite3.connect(
+                f'{Path(self.db_path).resolve().as_uri()}?mode=ro',
+                uri=True,
+                timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                check_same_thread=False
+            )
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+            conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        return conn
+    
+    @contextmanager
+    def read_connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool.
+        
+        A new connection is opened when the pool is empty, and connections
+        beyond READ_POOL_SIZE are closed instead of being returned.
+        """
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
     
     def _ensure_db(self):
         """Ensure metrics database exists with proper schema."""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            # WAL is persistent on the database file, so setting it once is enough
+            conn.execute('PRAGMA journal_mode=WAL')
+            
+            # Tables from an older schema are renamed aside, recreated below
+            # and their rows copied across in the same transaction
+            legacy_tables = []
+            if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+                legacy_tables = [table for table in METRICS_TABLES if table in existing]
+                if legacy_tables:
+                    conn.execute('BEGIN IMMEDIATE')
+                    for table in legacy_tables:
+                        conn.execute(f'ALTER TABLE {table} RENAME TO {table}_legacy')
+            
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS api_metrics (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -55,7 +330,8 @@ class MetricsCollector:
                     method TEXT NOT NULL,
                     response_time REAL NOT NULL,
                     status_code INTEGER NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    sample_rate REAL NOT NULL DEFAULT 1.0,
+                    ts INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                 )
             ''')
             
@@ -64,9 +340,9 @@ class MetricsCollector:
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     error_type TEXT NOT NULL,
                     message TEXT NOT NULL,
-                    stack_trace TEXT,
+                    stack_trace BLOB,
                     context TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    ts INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                 )
             ''')
             
@@ -77,7 +353,7 @@ class MetricsCollector:
                     user_agent TEXT,
                     ip_address TEXT,
                     details TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    ts INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                 )
             ''')
             
@@ -88,90 +364,183 @@ class MetricsCollector:
                     status TEXT NOT NULL,
                     response_time REAL,
                     details TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    ts INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                 )
             ''')
             
+            # Hourly pre-aggregates of raw rows past the retention window
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS api_metrics_hourly (
+                    hour INTEGER NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    calls INTEGER NOT NULL,
+                    sum_response_time REAL NOT NULL,
+                    error_calls INTEGER NOT NULL,
+                    PRIMARY KEY (hour, endpoint)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS errors_hourly (
+                    hour INTEGER NOT NULL,
+                    error_type TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (hour, error_type)
+                )
+            ''')
+            
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS usage_events_hourly (
+                    hour INTEGER NOT NULL,
+                    event_type TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (hour, event_type)
+                )
+            ''')
+            
+            for table in legacy_tables:
+                self._copy_legacy_rows(conn, table)
+            
+            # Timestamp indexes keep windowed scans proportional to the window;
+            # the api_metrics one also covers the columns the summary aggregates
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_api_metrics_ts ON api_metrics(ts, status_code, response_time, sample_rate)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_errors_ts ON errors(ts)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_usage_events_ts ON usage_events(ts)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_health_checks_ts ON health_checks(ts)')
+            
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
             conn.commit()
     
-    def record_api_call(self, endpoint: str, method: str, response_time: float, status_code: int):
-        """Record API call metrics."""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    'INSERT INTO api_metrics (endpoint, method, response_time, status_code) VALUES (?, ?, ?, ?)',
-                    (endpoint, method, response_time, status_code)
-                )
-                conn.commit()
-        except Exception as e:
-            logger.error(f"Failed to record API call: {e}")
+    @staticmethod
+    def _copy_legacy_rows(conn: sqlite3.Connection, table: str):
+        """Copy rows from a renamed pre-version-1 table into its replacement.
+        
+        TEXT 'YYYY-MM-DD HH:MM:SS' times (raw timestamp, hourly bucket) are
+        converted to unix seconds; columns the old table lacks take their
+        defaults. The legacy table is dropped afterwards.
+        """
+        columns, values = [], []
+        for row in conn.execute(f'PRAGMA table_info({table}_legacy)'):
+            name = row[1]
+            if name == 'timestamp':
+                columns.append('ts')
+                values.append("COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), 0)")
+            elif name == 'hour':
+                columns.append('hour')
+                values.append("CAST(strftime('%s', hour) AS INTEGER)")
+            else:
+                columns.append(name)
+                values.append(name)
+        conn.execute(
+            f'INSERT INTO {table} ({", ".join(columns)}) '
+            f'SELECT {", ".join(values)} FROM {table}_legacy'
+        )
+        conn.execute(f'DROP TABLE {table}_legacy')
+    
+    def record_api_call(self, endpoint: str, method: str, response_time: float, status_code: int, sample_rate: float = 1.0):
+        """Record API call metrics.
+        
+        Args:
+            endpoint: Endpoint path
+            method: HTTP method
+            response_time: Response time in seconds
+            status_code: HTTP status code
+            sample_rate: Fraction of comparable calls being recorded, used to
+                scale counts back up in summaries
+        """
+        self._queue.put((
+            INSERT_API_METRIC_SQL,
+            (endpoint, method, response_time, status_code, sample_rate, int(time.time()))
+        ))
     
     def record_error(self, error_type: str, message: str, stack_trace: Optional[str] = None, context: Optional[Dict] = None):
         """Record application errors."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    'INSERT INTO errors (error_type, message, stack_trace, context) VALUES (?, ?, ?, ?)',
-                    (error_type, message, stack_trace, json.dumps(context) if context else None)
-                )
-                conn.commit()
+            self._queue.put((
+                INSERT_ERROR_SQL,
+                (error_type, message, stack_trace, _dumps(context) if context else None, int(time.time()))
+            ))
+        except Exception as e:
+            logger.error(f"Failed to record error: {e}")
+    
+    def record_exception(self, error_type: str, exc_info: Tuple, context: Optional[Dict] = None):
+        """Record an exception, deferring traceback formatting to the writer thread.
+        
+        Args:
+            error_type: Error category to store
+            exc_info: (type, value, traceback) tuple from sys.exc_info()
+            context: Optional context to store with the error
+        """
+        try:
+            self._queue.put((
+                INSERT_ERROR_SQL,
+                (error_type, str(exc_info[1]), exc_info, _dumps(context) if context else None, int(time.time()))
+            ))
         except Exception as e:
             logger.error(f"Failed to record error: {e}")
     
     def record_usage_event(self, event_type: str, user_agent: Optional[str] = None, ip_address: Optional[str] = None, details: Optional[Dict] = None):
         """Record usage events."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    'INSERT INTO usage_events (event_type, user_agent, ip_address, details) VALUES (?, ?, ?, ?)',
-                    (event_type, user_agent, ip_address, json.dumps(details) if details else None)
-                )
-                conn.commit()
+            self._queue.put((
+                INSERT_USAGE_EVENT_SQL,
+                (event_type, user_agent, ip_address, _dumps(details) if details else None, int(time.time()))
+            ))
         except Exception as e:
             logger.error(f"Failed to record usage event: {e}")
     
     def record_health_check(self, check_name: str, status: str, response_time: Optional[float] = None, details: Optional[Dict] = None):
         """Record health check results."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute(
-                    'INSERT INTO health_checks (check_name, status, response_time, details) VALUES (?, ?, ?, ?)',
-                    (check_name, status, response_time, json.dumps(details) if details else None)
-                )
-                conn.commit()
+            self._queue.put((
+                INSERT_HEALTH_CHECK_SQL,
+                (check_name, status, response_time, _dumps(details) if details else None, int(time.time()))
+            ))
         except Exception as e:
             logger.error(f"Failed to record health check: {e}")
     
     def get_metrics_summary(self, hours: int = 24) -> Dict[str, Any]:
         """Get metrics summary for the last N hours."""
+        since = int(time.time()) - int(hours) * 3600
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                # API metrics
-                api_metrics = conn.execute('''
+            with self.read_connection() as conn:
+                # API metrics, error count and usage events in one round trip;
+                # raw rows cover the retention window and hourly rollups cover
+                # anything older (at hour granularity). Sampled API rows are
+                # weighted by 1 / sample_rate, so API figures are estimates.
+                api_calls, avg_response_time, api_errors, error_count, usage_count = conn.execute('''
+                    WITH raw AS (
+                        SELECT 
+                            TOTAL(1.0 / sample_rate) as calls,
+                            TOTAL(response_time / sample_rate) as sum_response_time,
+                            TOTAL(CASE WHEN status_code >= 400 THEN 1.0 / sample_rate END) as error_calls
+                        FROM api_metrics 
+                        WHERE ts > :since
+                    ), rolled AS (
+                        SELECT 
+                            TOTAL(calls) as calls,
+                            TOTAL(sum_response_time) as sum_response_time,
+                            TOTAL(error_calls) as error_calls
+                        FROM api_metrics_hourly 
+                        WHERE hour >= :since_hour
+                    )
                     SELECT 
-                        COUNT(*) as total_calls,
-                        AVG(response_time) as avg_response_time,
-                        COUNT(CASE WHEN status_code >= 400 THEN 1 END) as error_count
-                    FROM api_metrics 
-                    WHERE timestamp > datetime('now', '-{} hours')
-                '''.format(hours)).fetchone()
-                
-                # Error count
-                error_count = conn.execute('''
-                    SELECT COUNT(*) FROM errors 
-                    WHERE timestamp > datetime('now', '-{} hours')
-                '''.format(hours)).fetchone()[0]
-                
-                # Usage events
-                usage_count = conn.execute('''
-                    SELECT COUNT(*) FROM usage_events 
-                    WHERE timestamp > datetime('now', '-{} hours')
-                '''.format(hours)).fetchone()[0]
+                        CAST(ROUND(raw.calls + rolled.calls) AS INTEGER),
+                        (raw.sum_response_time + rolled.sum_response_time) / NULLIF(raw.calls + rolled.calls, 0),
+                        CAST(ROUND(raw.error_calls + rolled.error_calls) AS INTEGER),
+                        (SELECT COUNT(*) FROM errors WHERE ts > :since)
+                            + (SELECT CAST(TOTAL(count) AS INTEGER) FROM errors_hourly
+                               WHERE hour >= :since_hour),
+                        (SELECT COUNT(*) FROM usage_events WHERE ts > :since)
+                            + (SELECT CAST(TOTAL(count) AS INTEGER) FROM usage_events_hourly
+                               WHERE hour >= :since_hour)
+                    FROM raw, rolled
+                ''', {'since': since, 'since_hour': since // 3600 * 3600}).fetchone()
                 
                 return {
-                    'total_api_calls': api_metrics[0] or 0,
-                    'avg_response_time': api_metrics[1] or 0,
-                    'api_errors': api_metrics[2] or 0,
+                    'total_api_calls': api_calls or 0,
+                    'avg_response_time': avg_response_time or 0,
+                    'api_errors': api_errors or 0,
                     'total_errors': error_count,
                     'usage_events': usage_count,
                     'period_hours': hours
@@ -185,18 +554,28 @@ metrics = MetricsCollector()
 
 def monitor_performance(endpoint: str):
     """Decorator to monitor API endpoint performance."""
+    method = 'GET'
+    
     def decorator(func: Callable) -> Callable:
+        # Bound once here so the per-request wrapper skips the attribute lookups
+        record_api_call = metrics.record_api_call
+        clock = time.perf_counter_ns
+        sample_rate = settings.metrics_sample_rate
+        
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            start_time = time.time()
+            start = clock()
             try:
                 result = await func(*args, **kwargs)
-                response_time = time.time() - start_time
-                metrics.record_api_call(endpoint, 'GET', response_time, 200)
+                response_time = (clock() - start) * 1e-9
+                # Slow calls are always kept; fast successes are sampled
+                if response_time > SLOW_REQUEST_THRESHOLD:
+                    record_api_call(endpoint, method, response_time, 200)
+                elif sample_rate >= 1.0 or random.random() < sample_rate:
+                    record_api_call(endpoint, method, response_time, 200, sample_rate)
                 return result
             except Exception as e:
-                response_time = time.time() - start_time
-                metrics.record_api_call(endpoint, 'GET', response_time, 500)
+                record_api_call(endpoint, method, (clock() - start) * 1e-9, 500)
                 metrics.record_error('API_ERROR', str(e), context={'endpoint': endpoint})
                 raise
         return wrapper
@@ -210,25 +589,45 @@ def log_error(error_type: str, context: Optional[Dict] = None):
             try:
                 return await func(*args, **kwargs)
             except Exception as e:
-                import traceback
-                stack_trace = traceback.format_exc()
-                metrics.record_error(error_type, str(e), stack_trace, context)
-                logger.error(f"{error_type}: {e}", exc_info=True)
+                exc_info = sys.exc_info()
+                metrics.record_exception(error_type, exc_info, context)
+                logger.error(f"{error_type}: {e}", exc_info=exc_info)
                 raise
         return wrapper
     return decorator
 
+# How long a health check result is reused before the check runs again
+HEALTH_CHECK_CACHE_TTL = 10  # seconds
+
 class HealthChecker:
-    """Performs health checks on various system components."""
+    """Performs health checks on various system components.
+    
+    Results are reused for HEALTH_CHECK_CACHE_TTL seconds so frequent probes
+    do not hammer the database or the Google API.
+    """
+    
+    _results = TTLCache(ttl=HEALTH_CHECK_CACHE_TTL)
+    
+    @staticmethod
+    def _ping_database(db_path: str):
+        """Run a trivial query against the database (blocking)."""
+        conn = sqlite3.connect(db_path)
+        try:
+            conn.execute('SELECT 1')
+        finally:
+            conn.close()
     
     @staticmethod
-    def check_database():
+    async def check_database():
         """Check database connectivity."""
+        return await HealthChecker._results.get_or_fetch('database', HealthChecker._check_database)
+    
+    @staticmethod
+    async def _check_database():
+        """Check database connectivity, bypassing the result cache."""
         start_time = time.time()
         try:
-            from .sync_token_db import DB_PATH
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.execute('SELECT 1')
+            await asyncio.to_thread(HealthChecker._ping_database, DB_PATH)
             response_time = time.time() - start_time
             metrics.record_health_check('database', 'healthy', response_time)
             return True
@@ -238,14 +637,17 @@ class HealthChecker:
             return False
     
     @staticmethod
-    def check_google_calendar():
+    async def check_google_calendar():
         """Check Google Calendar API connectivity."""
+        return await HealthChecker._results.get_or_fetch('google_calendar', HealthChecker._check_google_calendar)
+    
+    @staticmethod
+    async def _check_google_calendar():
+        """Check Google Calendar API connectivity, bypassing the result cache."""
         start_time = time.time()
         try:
-            from .google_calendar import get_upcoming_events
-
             # Try to fetch a small amount of data
-            events = get_upcoming_events()
+            events = await get_upcoming_events()
             response_time = time.time() - start_time
             metrics.record_health_check('google_calendar', 'healthy', response_time)
             return True
@@ -255,11 +657,15 @@ class HealthChecker:
             return False
     
     @staticmethod
-    def run_all_checks() -> Dict[str, bool]:
-        """Run all health checks."""
+    async def run_all_checks() -> Dict[str, bool]:
+        """Run all health checks concurrently."""
+        database, google_calendar = await asyncio.gather(
+            HealthChecker.check_database(),
+            HealthChecker.check_google_calendar()
+        )
         return {
-            'database': HealthChecker.check_database(),
-            'google_calendar': HealthChecker.check_google_calendar()
+            'database': database,
+            'google_calendar': google_calendar
         }
 
 # Global health checker instance
@@ -5,8 +5,13 @@ Provides security features including rate limiting, input validation,
 secure error handling, and CORS configuration.
 """
 
+import logging
+import os
+import re
 import time
+import uuid
 from collections import defaultdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, Request, status
@@ -15,6 +20,21 @@ from pydantic import ValidationError
 
 from ..core.config import settings
 
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # Redis is optional; without it limits stay per-process
+    aioredis = None
+    RedisError = Exception
+
+logger = logging.getLogger(__name__)
+
+# ZIP/postal code: digits with an optional dash-separated extension (e.g. 12345-6789)
+_ZIP_RE = re.compile(r"^\d{3,10}(?:-\d{3,10})?$")
+
+# Translation table that deletes characters forbidden in filenames
+_FORBIDDEN_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+
 
 class RateLimiter:
     """Simple in-memory rate limiter."""
@@ -58,8 +78,99 @@ class RateLimiter:
         return max(0, max_requests - len(self.requests[client_id]))
 
 
-# Global rate limiter instance
-rate_limiter = RateLimiter()
+class RedisRateLimiter:
+    """
+    Sliding-window rate limiter backed by a Redis sorted set.
+    
+    Each client's request timestamps live in one sorted set, trimmed and
+    counted inside a Lua script so the check-and-record step is atomic and
+    limits hold across all worker processes. When Redis is not configured,
+    not installed, or unreachable, the in-memory fallback limiter is used;
+    after a failure Redis is left alone for REDIS_RETRY_INTERVAL seconds.
+    """
+    
+    # Keep a blackholed Redis host from stalling requests
+    REDIS_SOCKET_TIMEOUT = 0.5  # seconds
+    
+    # How long to stay on the in-memory fallback after a Redis failure
+    REDIS_RETRY_INTERVAL = 30  # seconds
+    
+    # KEYS[1]: client key; ARGV: now (ms), window (ms), max requests, member
+    # Returns {allowed (1/0), requests in the window after this one}
+    CHECK_SCRIPT = """
+        redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1] - ARGV[2])
+        local count = redis.call('ZCARD', KEYS[1])
+        if count < tonumber(ARGV[3]) then
+            redis.call('ZADD', KEYS[1], ARGV[1], ARGV[4])
+            redis.call('PEXPIRE', KEYS[1], ARGV[2])
+            return {1, count + 1}
+        end
+        return {0, count}
+    """
+    
+    def __init__(self, redis_url: Optional[str], fallback: RateLimiter, key_prefix: str = "ratelimit:"):
+        self.fallback = fallback
+        self.key_prefix = key_prefix
+        self._redis = None
+        self._retry_at = 0.0
+        self._unavailable = False
+        
+        if redis_url and aioredis is None:
+            logger.warning("REDIS_URL is set but the redis package is not installed; using in-memory rate limiting")
+        elif redis_url:
+            self._redis = aioredis.from_url(
+                redis_url,
+                socket_connect_timeout=self.REDIS_SOCKET_TIMEOUT,
+                socket_timeout=self.REDIS_SOCKET_TIMEOUT
+            )
+            self._check = self._redis.register_script(self.CHECK_SCRIPT)
+    
+    async def check(self, client_id: str, max_requests: int, window: int) -> Tuple[bool, int]:
+        """
+        Check and record a request against the rate limit in one round trip.
+        
+        Args:
+            client_id: Unique identifier for the client (IP, user ID, etc.)
+            max_requests: Maximum number of requests allowed
+            window: Time window in seconds
+            
+        Returns:
+            Tuple of whether the request is allowed and the requests remaining
+        """
+        if self._redis is None or time.monotonic() < self._retry_at:
+            return self._check_fallback(client_id, max_requests, window)
+        
+        try:
+            allowed, count = await self._check(
+                keys=[self.key_prefix + client_id],
+                args=[int(time.time() * 1000), window * 1000, max_requests, uuid.uuid4().hex]
+            )
+        except RedisError as e:
+            # Log once per outage, then skip Redis until the retry window passes
+            if not self._unavailable:
+                logger.warning(f"Redis rate limiter unavailable, using in-memory fallback: {type(e).__name__}")
+                self._unavailable = True
+            self._retry_at = time.monotonic() + self.REDIS_RETRY_INTERVAL
+            return self._check_fallback(client_id, max_requests, window)
+        
+        if self._unavailable:
+            logger.info("Redis rate limiter reachable again")
+            self._unavailable = False
+        return bool(allowed), max(0, max_requests - int(count))
+    
+    def _check_fallback(self, client_id: str, max_requests: int, window: int) -> Tuple[bool, int]:
+        """Check and record a request with the in-memory limiter."""
+        allowed = self.fallback.is_allowed(client_id, max_requests, window)
+        return allowed, self.fallback.get_remaining(client_id, max_requests, window)
+    
+    async def close(self):
+        """Close the Redis connection pool, if any."""
+        if self._redis is not None:
+            await self._redis.aclose()
+
+
+# Global rate limiter instance (shared through Redis when REDIS_URL is set)
+rate_limiter = RedisRateLimiter(settings.redis_url, fallback=RateLimiter())
 
 
 def get_client_id(request: Request) -> str:
@@ -67,7 +178,9 @@ def get_client_id(request: Request) -> str:
     # Use X-Forwarded-For for proxy support, fallback to client.host
     forwarded_for = request.headers.get("X-Forwarded-For")
     if forwarded_for:
-        return forwarded_for.split(",")[0].strip()
+        # First hop only; avoid building a list of every proxy address
+        comma = forwarded_for.find(",")
+        return (forwarded_for if comma < 0 else forwarded_for[:comma]).strip()
     return request.client.host if request.client else "unknown"
 
 
@@ -97,7 +210,11 @@ def validate_coordinates(lat: float, lon: float) -> Tuple[float, float]:
             detail="Longitude must be between -180 and 180 degrees"
         )
     
-    return float(lat), float(lon)
+    # FastAPI already hands us floats; only convert other numeric types
+    return (
+        lat if type(lat) is float else float(lat),
+        lon if type(lon) is float else float(lon)
+    )
 
 
 def validate_location_input(
@@ -128,7 +245,7 @@ def validate_location_input(
             detail="State name too long (max 50 characters)"
         )
     
-    if zip_code and not zip_code.strip().replace("-", "").isdigit():
+    if zip_code and not _ZIP_RE.fullmatch(zip_code.strip()):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid ZIP code format"
@@ -154,8 +271,6 @@ def secure_error_response(error: Exception, include_details: bool = False) -> Di
         }
     
     # Log the full error for debugging
-    import logging
-    logger = logging.getLogger(__name__)
     logger.error(f"Application error: {error}", exc_info=True)
     
     return {
@@ -196,15 +311,8 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         str: Sanitized filename
     """
-    import os
-    import re
-
-    # Remove path separators and other dangerous characters
-    sanitized = re.sub(r'[<>:"/\\|?*]', '', filename)
-    
-    # Limit length
-    if len(sanitized) > 255:
-        sanitized = sanitized[:255]
+    # Remove path separators and other dangerous characters, then limit length
+    sanitized = filename.translate(_FORBIDDEN_FILENAME_CHARS)[:255]
     
     # Ensure it's not empty
     if not sanitized.strip():
@@ -213,6 +321,12 @@ def sanitize_filename(filename: str) -> str:
     return sanitized
 
 
+@lru_cache(maxsize=64)
+def _resolve_allowed_dir(allowed_dir: str) -> str:
+    """Resolve an allowed base directory once and reuse the result."""
+    return os.path.realpath(allowed_dir)
+
+
 def validate_file_path(file_path: str, allowed_dirs: List[str]) -> bool:
     """
     Validate file path to prevent path traversal attacks.
@@ -224,17 +338,19 @@ def validate_file_path(file_path: str, allowed_dirs: List[str]) -> bool:
     Returns:
         bool: True if path is safe, False otherwise
     """
-    import os
-    
     try:
-        # Resolve the path
-        resolved_path = os.path.abspath(file_path)
+        # Resolve the path, following symlinks
+        resolved_path = os.path.realpath(file_path)
         
         # Check if path is within allowed directories
         for allowed_dir in allowed_dirs:
-            allowed_abs = os.path.abspath(allowed_dir)
-            if resolved_path.startswith(allowed_abs):
-                return True
+            allowed_abs = _resolve_allowed_dir(allowed_dir)
+            try:
+                if os.path.commonpath([resolved_path, allowed_abs]) == allowed_abs:
+                    return True
+            except ValueError:
+                # Paths on different drives never overlap
+                continue
         
         return False
     except Exception:
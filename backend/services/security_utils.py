@@ -6,7 +6,17 @@ secret masking for logging and error responses.
 """
 
 import re
-from typing import Any, Dict, List, Optional, Union
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# Lowercase substrings that at least one SECRET_PATTERNS entry requires;
+# strings containing none of them (and no digit run) cannot match.
+_MARKERS = (
+    'key', 'appid', 'token', 'auth', 'secret', 'password', 'bearer',
+    '://', '-----begin', 'eyj'
+)
+_DIGIT_RUN = re.compile(r'\d{3}')
 
 
 class SecretMasker:
@@ -72,6 +82,11 @@ class SecretMasker:
         if not text:
             return text
         
+        # Fast path: most log strings contain nothing that could be a secret
+        text_lower = text.lower()
+        if not any(marker in text_lower for marker in _MARKERS) and not _DIGIT_RUN.search(text):
+            return text
+        
         masked_text = text
         
         # Apply pattern-based masking
@@ -89,6 +104,9 @@ class SecretMasker:
         """
         Recursively mask sensitive information in a dictionary.
         
+        The dictionary is only copied once a value actually needs masking;
+        if nothing changes the original object is returned.
+        
         Args:
             data: Dictionary to mask
             mask_char: Character to use for masking
@@ -99,35 +117,36 @@ class SecretMasker:
         if not isinstance(data, dict):
             return data
         
-        masked_data = {}
+        masked_data: Optional[Dict[str, Any]] = None
         
-        for key, value in data.items():
+        for index, (key, value) in enumerate(data.items()):
             # Check if key indicates sensitive data
-            key_lower = key.lower()
-            is_sensitive = any(sensitive in key_lower for sensitive in self.SENSITIVE_FIELDS)
-            
-            if is_sensitive:
-                if isinstance(value, str):
-                    masked_data[key] = f'{mask_char * 8}'
-                elif isinstance(value, (dict, list)):
-                    masked_data[key] = f'{mask_char * 8}'
-                else:
-                    masked_data[key] = f'{mask_char * 8}'
+            if _is_sensitive_key(key):
+                masked_value = f'{mask_char * 8}'
             elif isinstance(value, dict):
-                masked_data[key] = self.mask_dict(value, mask_char)
+                masked_value = self.mask_dict(value, mask_char)
             elif isinstance(value, list):
-                masked_data[key] = self.mask_list(value, mask_char)
+                masked_value = self.mask_list(value, mask_char)
             elif isinstance(value, str):
-                masked_data[key] = self.mask_string(value, mask_char)
+                masked_value = self.mask_string(value, mask_char)
             else:
-                masked_data[key] = value
+                masked_value = value
+            
+            if masked_data is None:
+                if masked_value is value:
+                    continue
+                # First change: copy the untouched entries seen so far
+                masked_data = dict(islice(data.items(), index))
+            masked_data[key] = masked_value
         
-        return masked_data
+        return data if masked_data is None else masked_data
     
     def mask_list(self, data: List[Any], mask_char: str = '*') -> List[Any]:
         """
         Recursively mask sensitive information in a list.
         
+        Like mask_dict, the list is only copied when an item changes.
+        
         Args:
             data: List to mask
             mask_char: Character to use for masking
@@ -138,7 +157,17 @@ class SecretMasker:
         if not isinstance(data, list):
             return data
         
-        return [self.mask_data(item, mask_char) for item in data]
+        masked_list: Optional[List[Any]] = None
+        
+        for index, item in enumerate(data):
+            masked_item = self.mask_data(item, mask_char)
+            if masked_list is None:
+                if masked_item is item:
+                    continue
+                masked_list = data[:index]
+            masked_list.append(masked_item)
+        
+        return data if masked_list is None else masked_list
     
     def mask_data(self, data: Any, mask_char: str = '*') -> Any:
         """
@@ -161,6 +190,19 @@ class SecretMasker:
             return data
 
 
+# Single alternation over all sensitive field names, so one scan of the
+# lowercased key decides sensitivity regardless of how many fields are listed
+_SENSITIVE_FIELD_RE = re.compile('|'.join(
+    re.escape(field) for field in sorted(SecretMasker.SENSITIVE_FIELDS)
+))
+
+
+@lru_cache(maxsize=1024)
+def _is_sensitive_key(key: str) -> bool:
+    """Check a field name against SENSITIVE_FIELDS, memoized per name."""
+    return _SENSITIVE_FIELD_RE.search(key.lower()) is not None
+
+
 # Global secret masker instance
 secret_masker = SecretMasker()
 
@@ -179,6 +221,21 @@ def mask_secrets(data: Any, mask_char: str = '*') -> Any:
     return secret_masker.mask_data(data, mask_char)
 
 
+def mask_secrets_batch(items: Iterable[Any], mask_char: str = '*') -> List[Any]:
+    """
+    Mask secrets in many items with one shared masker.
+    
+    Args:
+        items: Iterable of data to mask
+        mask_char: Character to use for masking
+        
+    Returns:
+        List of masked items, in input order
+    """
+    mask_data = secret_masker.mask_data
+    return [mask_data(item, mask_char) for item in items]
+
+
 def sanitize_for_logging(data: Any) -> Any:
     """
     Sanitize data for safe logging by masking secrets.
@@ -229,8 +286,7 @@ def is_sensitive_field(field_name: str) -> bool:
     Returns:
         True if the field is sensitive
     """
-    field_lower = field_name.lower()
-    return any(sensitive in field_lower for sensitive in secret_masker.SENSITIVE_FIELDS)
+    return _is_sensitive_key(field_name)
 
 
 def create_safe_log_message(message: str, **kwargs) -> str:
@@ -1,6 +1,7 @@
 import os
 import sqlite3
-from typing import Dict, Optional
+import threading
+from typing import Optional
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
 if not os.path.exists(DATA_DIR):
@@ -22,21 +23,32 @@ CREATE TABLE IF NOT EXISTS calendar_colors (
 );
 '''
 
+# Shared connection, opened on first use and reused for the process lifetime
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+def _get_connection() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        with _lock:
+            if _conn is None:
+                conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256)
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.executescript(CREATE_SYNC_TABLE_SQL + CREATE_COLORS_TABLE_SQL)
+                _conn = conn
+    return _conn
+
 def ensure_tables_exist():
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.execute(CREATE_SYNC_TABLE_SQL)
-        conn.execute(CREATE_COLORS_TABLE_SQL)
-        conn.commit()
+    _get_connection()
 
 def get_sync_token(calendar_id: str) -> Optional[str]:
-    ensure_tables_exist()
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.execute('SELECT sync_token FROM calendar_sync_tokens WHERE calendar_id = ?', (calendar_id,))
-        row = cur.fetchone()
-        return row[0] if row else None
+    conn = _get_connection()
+    with _lock:
+        row = conn.execute('SELECT sync_token FROM calendar_sync_tokens WHERE calendar_id = ?', (calendar_id,)).fetchone()
+    return row[0] if row else None
 
 def set_sync_token(calendar_id: str, sync_token: str) -> None:
-    ensure_tables_exist()
-    with sqlite3.connect(DB_PATH) as conn:
+    conn = _get_connection()
+    with _lock:
         conn.execute('REPLACE INTO calendar_sync_tokens (calendar_id, sync_token) VALUES (?, ?)', (calendar_id, sync_token))
-        conn.commit()
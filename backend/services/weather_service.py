@@ -3,13 +3,17 @@ Weather/AQI Utility Functions
 
 Fetches current weather, AQI, and 5-day forecast from OpenWeatherMap.
 """
-import json
+import asyncio
 import logging
 import os
+from functools import lru_cache
 from typing import Any, Dict
 
-import aiohttp
+import orjson
 
+from ..core.config import settings
+from .cache import TTLCache, coordinate_key
+from .http_client import GEOCODE_CACHE_TTL, http_client
 from .security_utils import sanitize_for_logging
 
 logger = logging.getLogger(__name__)
@@ -17,13 +21,17 @@ logger = logging.getLogger(__name__)
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
 CREDENTIALS_FILE = os.path.join(DATA_DIR, "credentials.json")
 
-# Load API key securely
+@lru_cache(maxsize=1)
+def _load_credentials() -> Dict[str, Any]:
+    """Read and parse credentials.json once per process."""
+    with open(CREDENTIALS_FILE, "rb") as f:
+        return orjson.loads(f.read())
+
+# Load API key securely, preferring the environment so no file access is needed
 try:
-    with open(CREDENTIALS_FILE, encoding="utf-8") as f:
-        creds = json.load(f)
-    API_KEY = creds["openweathermap_api_key"]
+    API_KEY = settings.openweathermap_api_key or _load_credentials()["openweathermap_api_key"]
     logger.info("Weather API credentials loaded successfully")
-except (FileNotFoundError, KeyError, json.JSONDecodeError) as e:
+except (FileNotFoundError, KeyError, orjson.JSONDecodeError) as e:
     logger.error(f"Failed to load weather API credentials: {type(e).__name__}")
     API_KEY = None
 
@@ -32,96 +40,139 @@ FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
 GEOCODE_URL = "https://api.openweathermap.org/geo/1.0/direct"
 GEOCODE_ZIP_URL = "https://api.openweathermap.org/geo/1.0/zip"
 
+_weather_cache = TTLCache(ttl=settings.cache_ttl)
+_forecast_cache = TTLCache(ttl=settings.cache_ttl)
+_geocode_cache = TTLCache(ttl=GEOCODE_CACHE_TTL)
+
 async def get_current_weather(lat: float, lon: float) -> Dict[str, Any]:
     """Fetch current weather for given coordinates using /data/2.5/weather."""
     if not API_KEY:
         raise ValueError("Weather API key not configured")
-    
-    async with aiohttp.ClientSession() as session:
-        url = f"{WEATHER_URL}?lat={lat}&lon={lon}&appid={API_KEY}&units=imperial"
+
+    if not settings.cache_enabled:
+        return await _fetch_current_weather(lat, lon)
+    return await _weather_cache.get_or_fetch(coordinate_key(lat, lon), lambda: _fetch_current_weather(lat, lon))
+
+async def _fetch_current_weather(lat: float, lon: float) -> Dict[str, Any]:
+    """Fetch current weather, bypassing the cache."""
+    session = await http_client.get_session()
+    params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "imperial"}
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
         logger.debug("Fetching current weather", extra={
             "extra_fields": {
                 "lat": lat,
                 "lon": lon,
-                "url": f"{WEATHER_URL}?lat={lat}&lon={lon}&appid=[REDACTED]&units=imperial"
+                "url": WEATHER_URL,
+                "params": {**params, "appid": "[REDACTED]"}
             }
         })
-        
-        async with session.get(url) as resp:
-            data = await resp.json()
+
+    async with session.get(WEATHER_URL, params=params) as resp:
+        # Raise on error statuses so an error body is never cached
+        resp.raise_for_status()
+        data = await resp.json(loads=orjson.loads)
+        if debug:
             logger.debug("Weather data retrieved successfully", extra={
                 "extra_fields": {
                     "status_code": resp.status,
-                    "response_size": len(str(data))
+                    "response_size": resp.content_length
                 }
             })
-        return {"weather": data}
+    return {"weather": data}
 
 async def get_forecast(lat: float, lon: float) -> Dict[str, Any]:
     """Fetch 5-day/3-hour forecast for given coordinates using /data/2.5/forecast."""
     if not API_KEY:
         raise ValueError("Weather API key not configured")
-    
-    async with aiohttp.ClientSession() as session:
-        url = f"{FORECAST_URL}?lat={lat}&lon={lon}&appid={API_KEY}&units=imperial"
+
+    if not settings.cache_enabled:
+        return await _fetch_forecast(lat, lon)
+    return await _forecast_cache.get_or_fetch(coordinate_key(lat, lon), lambda: _fetch_forecast(lat, lon))
+
+async def _fetch_forecast(lat: float, lon: float) -> Dict[str, Any]:
+    """Fetch the forecast, bypassing the cache."""
+    session = await http_client.get_session()
+    params = {"lat": lat, "lon": lon, "appid": API_KEY, "units": "imperial"}
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
         logger.debug("Fetching weather forecast", extra={
             "extra_fields": {
                 "lat": lat,
                 "lon": lon,
-                "url": f"{FORECAST_URL}?lat={lat}&lon={lon}&appid=[REDACTED]&units=imperial"
+                "url": FORECAST_URL,
+                "params": {**params, "appid": "[REDACTED]"}
             }
         })
-        
-        async with session.get(url) as resp:
-            data = await resp.json()
+
+    async with session.get(FORECAST_URL, params=params) as resp:
+        # Raise on error statuses so an error body is never cached
+        resp.raise_for_status()
+        data = await resp.json(loads=orjson.loads)
+        if debug:
             logger.debug("Forecast data retrieved successfully", extra={
                 "extra_fields": {
                     "status_code": resp.status,
-                    "response_size": len(str(data))
+                    "response_size": resp.content_length
                 }
             })
-        return {"forecast": data}
+    return {"forecast": data}
+
+async def get_weather_bundle(lat: float, lon: float) -> Dict[str, Any]:
+    """Fetch current weather and forecast for the same coordinates concurrently."""
+    current, forecast = await asyncio.gather(get_current_weather(lat, lon), get_forecast(lat, lon))
+    return {**current, **forecast}
 
 async def get_lat_lon(lat: float = None, lon: float = None, city: str = None, state: str = None, zip_code: str = None, country: str = "US") -> (float, float):
     """Resolve lat/lon from direct input or by geocoding city/state/zip."""
     if not API_KEY:
         raise ValueError("Weather API key not configured")
-    
+
     if lat is not None and lon is not None:
         return float(lat), float(lon)
-    
-    async with aiohttp.ClientSession() as session:
-        if zip_code:
-            url = f"{GEOCODE_ZIP_URL}?zip={zip_code},{country}&appid={API_KEY}"
+    if not zip_code and not city:
+        raise ValueError("Must provide lat/lon or city or zip_code")
+
+    if not settings.cache_enabled:
+        return await _geocode(city, state, zip_code, country)
+    return await _geocode_cache.get_or_fetch(
+        (zip_code, city, state, country), lambda: _geocode(city, state, zip_code, country)
+    )
+
+async def _geocode(city: str, state: str, zip_code: str, country: str) -> (float, float):
+    """Geocode a ZIP code or city/state, bypassing the cache."""
+    session = await http_client.get_session()
+    if zip_code:
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Geocoding ZIP code", extra={
                 "extra_fields": {
                     "zip_code": zip_code,
                     "country": country,
-                    "url": f"{GEOCODE_ZIP_URL}?zip={zip_code},{country}&appid=[REDACTED]"
+                    "url": GEOCODE_ZIP_URL
                 }
             })
-            
-            async with session.get(url) as resp:
-                data = await resp.json()
-            return data["lat"], data["lon"]
-        elif city:
-            q = city
-            if state:
-                q += f",{state}"
-            url = f"{GEOCODE_URL}?q={q},{country}&limit=1&appid={API_KEY}"
+
+        params = {"zip": f"{zip_code},{country}", "appid": API_KEY}
+        async with session.get(GEOCODE_ZIP_URL, params=params) as resp:
+            data = await resp.json(loads=orjson.loads)
+        return data["lat"], data["lon"]
+    else:
+        q = city
+        if state:
+            q += f",{state}"
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Geocoding city", extra={
                 "extra_fields": {
                     "city": city,
                     "state": state,
                     "country": country,
-                    "url": f"{GEOCODE_URL}?q={q},{country}&limit=1&appid=[REDACTED]"
+                    "url": GEOCODE_URL
                 }
             })
-            
-            async with session.get(url) as resp:
-                data = await resp.json()
-            if not data:
-                raise ValueError("Location not found")
-            return data[0]["lat"], data[0]["lon"]
-        else:
-            raise ValueError("Must provide lat/lon or city or zip_code") 
\ No newline at end of file
+
+        params = {"q": f"{q},{country}", "limit": 1, "appid": API_KEY}
+        async with session.get(GEOCODE_URL, params=params) as resp:
+            data = await resp.json(loads=orjson.loads)
+        if not data:
+            raise ValueError("Location not found")
+        return data[0]["lat"], data[0]["lon"]
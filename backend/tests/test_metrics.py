@@ -12,96 +12,121 @@ from typing import Any, Dict
 
 import httpx
 
+# Metric families the endpoint is expected to expose
+WANTED_METRICS = frozenset({"http_requests_total", "weather_requests_total"})
 
-async def test_metrics_endpoint(base_url: str = "http://localhost:8000") -> Dict[str, Any]:
-    """Test the metrics endpoint and return results."""
+
+async def test_metrics_endpoint(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Test the metrics endpoint using a shared client and return results."""
     results = {
         "endpoint_accessible": False,
+        "status_code": None,
         "content_type": None,
         "metrics_count": 0,
         "has_http_metrics": False,
         "has_business_metrics": False,
+        "sample_metrics": [],
         "error": None
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            # Test metrics endpoint
-            response = await client.get(f"{base_url}/metrics")
+        # Stream the metrics body so large scrapes are never held in memory
+        async with client.stream("GET", "/metrics") as response:
+            results["status_code"] = response.status_code
             
             if response.status_code == 200:
                 results["endpoint_accessible"] = True
                 results["content_type"] = response.headers.get("content-type")
                 
-                # Parse metrics content
-                content = response.text
-                metrics_lines = [line.strip() for line in content.split('\n') if line.strip()]
-                results["metrics_count"] = len(metrics_lines)
-                
-                # Check for specific metric types
-                results["has_http_metrics"] = any("http_requests_total" in line for line in metrics_lines)
-                results["has_business_metrics"] = any("weather_requests_total" in line for line in metrics_lines)
-                
-                print("✅ Metrics endpoint is accessible")
-                print(f"   Content-Type: {results['content_type']}")
-                print(f"   Metrics count: {results['metrics_count']}")
-                print(f"   Has HTTP metrics: {results['has_http_metrics']}")
-                print(f"   Has business metrics: {results['has_business_metrics']}")
-                
-                # Show sample metrics
-                print("\n📊 Sample metrics:")
-                for line in metrics_lines[:10]:  # Show first 10 metrics
-                    if line and not line.startswith('#'):
-                        print(f"   {line}")
-                
+                # Count lines, check metric types and keep samples on the fly
+                has_http = has_business = False
+                async for line in response.aiter_lines():
+                    line = line.strip()
+                    if not line:
+                        continue
+                    results["metrics_count"] += 1
+                    # Compare the sample's metric name rather than substring-scanning
+                    name = line.split('{', 1)[0].split(' ', 1)[0]
+                    if name in WANTED_METRICS:
+                        has_http = has_http or name == "http_requests_total"
+                        has_business = has_business or name == "weather_requests_total"
+                    if results["metrics_count"] <= 10 and not line.startswith('#'):
+                        results["sample_metrics"].append(line)
+                results["has_http_metrics"] = has_http
+                results["has_business_metrics"] = has_business
             else:
+                await response.aread()
                 results["error"] = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Metrics endpoint returned status {response.status_code}")
-                
+            
     except httpx.ConnectError:
         results["error"] = "Could not connect to server"
-        print("❌ Could not connect to server. Make sure the backend is running.")
     except Exception as e:
         results["error"] = str(e)
-        print(f"❌ Error testing metrics endpoint: {e}")
     
     return results
 
 
-async def test_health_endpoint(base_url: str = "http://localhost:8000") -> Dict[str, Any]:
-    """Test the health endpoint to ensure it's working."""
+async def test_health_endpoint(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Test the health endpoint using a shared client to ensure it's working."""
     results = {
         "endpoint_accessible": False,
+        "status_code": None,
         "status": None,
         "response_time_ms": None,
         "error": None
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(f"{base_url}/health")
+        response = await client.get("/health")
+        results["status_code"] = response.status_code
+        
+        if response.status_code == 200:
+            data = response.json()
+            results["endpoint_accessible"] = True
+            results["status"] = data.get("status")
+            results["response_time_ms"] = data.get("response_time_ms")
+        else:
+            results["error"] = f"HTTP {response.status_code}: {response.text}"
             
-            if response.status_code == 200:
-                data = response.json()
-                results["endpoint_accessible"] = True
-                results["status"] = data.get("status")
-                results["response_time_ms"] = data.get("response_time_ms")
-                
-                print("✅ Health endpoint is accessible")
-                print(f"   Status: {results['status']}")
-                print(f"   Response time: {results['response_time_ms']}ms")
-                
-            else:
-                results["error"] = f"HTTP {response.status_code}: {response.text}"
-                print(f"❌ Health endpoint returned status {response.status_code}")
-                
     except Exception as e:
         results["error"] = str(e)
-        print(f"❌ Error testing health endpoint: {e}")
     
     return results
 
 
+def print_health_results(results: Dict[str, Any]) -> None:
+    """Print the outcome of the health endpoint probe."""
+    if results["endpoint_accessible"]:
+        print("✅ Health endpoint is accessible")
+        print(f"   Status: {results['status']}")
+        print(f"   Response time: {results['response_time_ms']}ms")
+    elif results["status_code"] is not None:
+        print(f"❌ Health endpoint returned status {results['status_code']}")
+    else:
+        print(f"❌ Error testing health endpoint: {results['error']}")
+
+
+def print_metrics_results(results: Dict[str, Any]) -> None:
+    """Print the outcome of the metrics endpoint probe."""
+    if results["endpoint_accessible"]:
+        print("✅ Metrics endpoint is accessible")
+        print(f"   Content-Type: {results['content_type']}")
+        print(f"   Metrics count: {results['metrics_count']}")
+        print(f"   Has HTTP metrics: {results['has_http_metrics']}")
+        print(f"   Has business metrics: {results['has_business_metrics']}")
+        
+        # Show sample metrics
+        print("\n📊 Sample metrics:")
+        for line in results["sample_metrics"]:
+            print(f"   {line}")
+    elif results["status_code"] is not None:
+        print(f"❌ Metrics endpoint returned status {results['status_code']}")
+    elif results["error"] == "Could not connect to server":
+        print("❌ Could not connect to server. Make sure the backend is running.")
+    else:
+        print(f"❌ Error testing metrics endpoint: {results['error']}")
+
+
 async def main():
     """Main test function."""
     print("🧪 Testing Family Dashboard Metrics Endpoint")
@@ -109,15 +134,24 @@ async def main():
     
     base_url = "http://localhost:8000"
     
-    # Test health endpoint first
+    # One pooled client for all probes so the connection is reused
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=10)
+    ) as client:
+        # Probe both endpoints concurrently; output is printed afterwards
+        health_task = asyncio.create_task(test_health_endpoint(client))
+        metrics_task = asyncio.create_task(test_metrics_endpoint(client))
+        health_results, metrics_results = await asyncio.gather(health_task, metrics_task)
+    
     print("\n1. Testing Health Endpoint")
     print("-" * 30)
-    health_results = await test_health_endpoint(base_url)
+    print_health_results(health_results)
     
-    # Test metrics endpoint
     print("\n2. Testing Metrics Endpoint")
     print("-" * 30)
-    metrics_results = await test_metrics_endpoint(base_url)
+    print_metrics_results(metrics_results)
     
     # Summary
     print("\n📋 Test Summary")